@@ -44,19 +44,39 @@ import sys
 import time
 
 class fpgacomm:
-  def __init__(self, serialport, baudrate=115200, addrchars=8, datachars=8, loglevel=logging.ERROR):
+  def __init__(self, serialport, baudrate=115200, addrchars=8, datachars=8, per_char_delay=0.0, loglevel=logging.ERROR):
     self._ser = serial.Serial()
     self._ser.port = serialport
     self._ser.baudrate = baudrate
     self._ser.timeout = 0.1
+    # Bound writes explicitly and make sure pyserial adds no hidden
+    # inter-byte latency on reads.
+    self._ser.write_timeout = 1.0
+    self._ser.inter_byte_timeout = None
     self._addrchars = addrchars
     self._datachars = datachars
+    self._per_char_delay = per_char_delay
+    # Pre-build the operation format strings and reply length once; the
+    # computed-width format specs would otherwise be re-parsed on every access.
+    self._wr_fmt = "w{{:0{:d}X}}{{:0{:d}X}}".format(addrchars, datachars)
+    self._rd_fmt = "r{{:0{:d}X}}".format(addrchars)
+    self._rd_len = 1+addrchars+datachars+2+1
     logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s', level=loglevel)
     self._log = logging.getLogger(__name__)
 
   def open(self):
     """Open the communication port."""
     self._ser.open()
+    # Request low-latency mode from the kernel (ASYNC_LOW_LATENCY). USB-UART
+    # bridges like FTDI otherwise batch received bytes behind a 16ms latency
+    # timer, which dominates the round-trip time of short replies.
+    # (For FTDI devices this can also be set via
+    # /sys/bus/usb-serial/devices/ttyUSB0/latency_timer.)
+    try:
+      self._ser.set_low_latency_mode(True)
+    except (AttributeError, ValueError, OSError):
+      # Not supported on all platforms/drivers.
+      pass
 
   def close(self):
     """Close the communication port."""
@@ -64,62 +84,88 @@ class fpgacomm:
 
   def serialWrite(self, string):
     """Write string to serial device."""
-    # Send characters with 10ms delay between each.
-    # This time allowance not required after implementing FPGA fix.
-    self._log.debug("Serial Tx: \'{:s}\'".format(string))
-    for c in string:
-      self._ser.write(c.encode())
-      time.sleep(0.01)
+    self._log.debug("Serial Tx: '%s'", string)
+    if self._per_char_delay:
+      # Send characters with delay between each.
+      # This time allowance not required after implementing FPGA fix, but is
+      # kept available (per_char_delay kwarg) for un-fixed FPGA firmware.
+      for c in string:
+        self._ser.write(c.encode('ascii'))
+        time.sleep(self._per_char_delay)
+    else:
+      self._ser.write(string.encode('ascii'))
     return
 
-  def serialRead(self, maxchars):
-    """Read string from serial device."""
-    string = self._ser.read(maxchars).decode('utf-8')
-    self._log.debug("Serial Rx: \'{:s}\'".format(string))
-    return string
+  def serialRead(self, maxchars, terminator=b'\n'):
+    """Read reply bytes from serial device, up to <terminator> or <maxchars>."""
+    # Replies are line-terminated, so read_until returns as soon as the
+    # device is done talking rather than waiting out the port timeout.
+    # The raw bytes are returned; decoding happens only for debug logging.
+    data = self._ser.read_until(terminator, size=maxchars)
+    if self._log.isEnabledFor(logging.DEBUG):
+      self._log.debug("Serial Rx: '%s'", data.decode('utf-8', 'replace'))
+    return data
 
   def regWrite(self, addr, data):
     """Write FPGA register at <addr> to value <data>, returns <data> or None."""
-    # Compose and send the operation, read the reply.
-    # Example: wAAAADDDDDDDD
-    wrstr = "w{addr:0{addrchars}X}{data:0{datachars}X}".format(
-      addr=addr, addrchars=self._addrchars,
-      data=data, datachars=self._datachars)
-    self.serialWrite(wrstr)
-    rdstr = self.serialRead(1+self._addrchars+self._datachars+2+1)
-    # Verify that the command was echoed, otherwise the operation failed.
-    if wrstr in rdstr:
-      wrdata = data
-    else:
-      wrdata = None;
-    # Do debug.
-    self._log.info("Addr 0x{:08X} write value 0x{:08X} => {:s}".format(
-        addr, data, ['FAILED', 'OK'][wrdata == data]))
-    return wrdata
+    return self.regWriteBlock(addr, [data])[0]
 
   def regRead(self, addr):
     """Read FPGA register at <addr>, returns <data> or None."""
-    # Compose and send the operation, read the reply.
+    return self.regReadBlock(addr, 1)[0]
+
+  def regWriteBlock(self, addr, values):
+    """Write sequential FPGA registers starting at <addr> with <values>,
+    returns list of <data> with None for each failed write."""
+    # Compose all operations and send them as one pipelined command stream,
+    # then read back all the replies at once. This amortizes the UART
+    # round-trip wait over the whole block instead of paying it per register.
+    # Example: wAAAADDDDDDDD
+    rdlen = self._rd_len
+    wrstrs = [self._wr_fmt.format(addr+n, data) for n, data in enumerate(values)]
+    self.serialWrite("".join(wrstrs))
+    # Verify that each command was echoed at the start of its reply,
+    # otherwise the operation failed. The reply format is positional and
+    # fixed-width, so a prefix compare suffices (no substring search).
+    wrdata = []
+    for n, wrstr in enumerate(wrstrs):
+      rdstr = self.serialRead(rdlen)
+      if rdstr.startswith(wrstr.encode('ascii')):
+        wrdata.append(values[n])
+      else:
+        wrdata.append(None)
+      # Do debug.
+      self._log.info("Addr 0x{:08X} write value 0x{:08X} => {:s}".format(
+        addr+n, values[n], ['FAILED', 'OK'][wrdata[n] == values[n]]))
+    return wrdata
+
+  def regReadBlock(self, addr, count):
+    """Read <count> sequential FPGA registers starting at <addr>,
+    returns list of <data> with None for each failed read."""
+    # Compose all operations and send them as one pipelined command stream,
+    # then read back all the replies at once (see regWriteBlock).
     # Example: rAAAADDDDDDDD
-    wrstr = "r{addr:0{addrchars}X}".format(
-      addr=addr, addrchars=self._addrchars)
-    self.serialWrite(wrstr)
-    rdlen = 1+self._addrchars+self._datachars+2+1;
-    rdstr = self.serialRead(rdlen)
-    # Verify that the command was echoed, otherwise the operation failed.
-    # Also parse the reply.
-    data = None
-    if ((len(rdstr) >= rdlen) and (rdstr[0] == 'r')):
-      if (int(rdstr[1:1+self._addrchars], 16) == addr):
-        data = int(rdstr[1+self._addrchars:1+self._addrchars+self._datachars], 16)
-    # Do debug.
-    if data is not None:
-      self._log.info("Addr 0x{:08X} read  value 0x{:08X} => {:s}".format(
-        addr, data, 'OK'))
-    else:
-      self._log.info("Addr 0x{:08X} read => {:s}".format(
-        addr, 'FAILED'))
-    return data
+    rdlen = self._rd_len
+    wrstrs = [self._rd_fmt.format(addr+n) for n in range(count)]
+    self.serialWrite("".join(wrstrs))
+    # Verify that each command was echoed, otherwise the operation failed.
+    # Also parse the replies by slicing at the known fixed field widths.
+    blockdata = []
+    for n in range(count):
+      reply = self.serialRead(rdlen).rstrip()
+      data = None
+      if ((len(reply) >= 1+self._addrchars+self._datachars) and (reply[0:1] == b'r')):
+        if (int(reply[1:1+self._addrchars], 16) == addr+n):
+          data = int(reply[1+self._addrchars:1+self._addrchars+self._datachars], 16)
+      # Do debug.
+      if data is not None:
+        self._log.info("Addr 0x{:08X} read  value 0x{:08X} => {:s}".format(
+          addr+n, data, 'OK'))
+      else:
+        self._log.info("Addr 0x{:08X} read => {:s}".format(
+          addr+n, 'FAILED'))
+      blockdata.append(data)
+    return blockdata
 
 def mainHelp():
   print('  Usage: fpgacomm [serport] [regaddr] {write value}')
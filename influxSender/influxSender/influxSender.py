@@ -30,17 +30,55 @@ Example Usage:
 # system
 import datetime
 import logging
+import queue
 import sys
+import threading
+import time
 # package
 from influxdb import InfluxDBClient
 
+# Per-type line protocol field formatters, dispatched on exact value type.
+# (bool is listed explicitly since it would otherwise not match the int entry.)
+_LINEFMT_QUOTED = {
+  float: lambda k, v: "{:s}={:0.7f}".format(k, v),
+  int: lambda k, v: "{:s}={:d}".format(k, v),
+  bool: lambda k, v: "{:s}={:d}".format(k, v),
+  str: lambda k, v: "{:s}=\"{:s}\"".format(k, v),
+}
+_LINEFMT_UNQUOTED = dict(_LINEFMT_QUOTED)
+_LINEFMT_UNQUOTED[str] = lambda k, v: "{:s}={:s}".format(k, v)
+
+def _lineformatDefault(k, v, fmttable):
+  # Subclasses miss the exact-type table (an IntEnum is not type int, a
+  # numpy float64 is not type float); render them as their nearest base
+  # type so they keep the formatting of the old isinstance chain.
+  for base in (bool, int, float, str):
+    if isinstance(v, base):
+      return fmttable[base](k, v)
+  return "{:s}={:}".format(k, v)
+
 class InfluxSender:
-  def __init__(self, loglevel=logging.ERROR):
-    """Create and initialize InfluxSender object."""
+  # Queue markers for the background worker.
+  _STOP = object()
+  _FLUSH = object()
+
+  def __init__(self, batch_size=100, flush_interval=1.0, queue_size=10000, loglevel=logging.ERROR):
+    """Create and initialize InfluxSender object.
+    Points are queued and transmitted by a background worker thread in
+    batches of <batch_size>, or whenever <flush_interval> seconds have
+    elapsed since the last transmission, whichever comes first. Send calls
+    therefore return immediately; up to <queue_size> points are held during
+    network stalls (beyond that, new points are dropped with an error)."""
     # Initialize state.
     self.database = ''
+    self._batch_size = batch_size
+    self._flush_interval = flush_interval
+    self._q = queue.Queue(maxsize=queue_size)
     logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s', level=loglevel)
     self._log = logging.getLogger(__name__)
+    # Start the transmit worker; daemon so an unclosed sender cannot hang exit.
+    self._worker = threading.Thread(target=self._workerLoop, daemon=True)
+    self._worker.start()
 
   def open(self, host, port, database):
     """Open access to the database."""
@@ -51,12 +89,75 @@ class InfluxSender:
     self.database = database
 
   def close(self):
-    """Close access to the database."""
+    """Close access to the database (flushes any queued points first)."""
     self._log.info("Close db=\'{:s}\'".format(self.database))
+    self._q.put(InfluxSender._STOP)
+    self._worker.join()
     self.dbclient.close()
     self.database = ''
     return
 
+  def flush(self):
+    """Block until all currently queued points have been sent."""
+    self._q.put(InfluxSender._FLUSH)
+    self._q.join()
+    return True
+
+  def _enqueue(self, dbstring):
+    """Queue one line protocol string for the background worker."""
+    try:
+      self._q.put_nowait(dbstring)
+    except queue.Full:
+      self._log.error("Send queue full, dropping point")
+      return False
+    return True
+
+  def _workerLoop(self):
+    """Background worker: batch queued points and transmit them."""
+    batch = []
+    last_flush = time.monotonic()
+    while True:
+      if not batch:
+        # Nothing pending; restart the flush interval from here.
+        last_flush = time.monotonic()
+      timeout = max(0.0, self._flush_interval - (time.monotonic() - last_flush))
+      try:
+        item = self._q.get(timeout=timeout)
+      except queue.Empty:
+        item = None
+      stop = item is InfluxSender._STOP
+      forced = stop or item is InfluxSender._FLUSH
+      if item is not None and not forced:
+        batch.append(item)
+      if batch and (forced or len(batch) >= self._batch_size or
+                    time.monotonic() - last_flush >= self._flush_interval):
+        self._sendBatch(batch)
+        for _ in batch:
+          self._q.task_done()
+        batch = []
+        last_flush = time.monotonic()
+      if forced:
+        self._q.task_done()
+      if stop:
+        return
+
+  def _sendBatch(self, batch):
+    """Send a batch of points as one newline-delimited line protocol write."""
+    batchstring = "\n".join(batch)
+    self._log.debug("Flushing batch:\n%s", batchstring)
+    # Retry transient failures with backoff before giving up on the batch.
+    for backoff in [0.1, 0.5, 2.0]:
+      try:
+        return self.dbclient.write_points(batchstring, database=self.database, protocol=u'line')
+      except Exception as e:
+        self._log.error("Batch write failed ({:}), retrying in {:}s".format(e, backoff))
+        time.sleep(backoff)
+    try:
+      return self.dbclient.write_points(batchstring, database=self.database, protocol=u'line')
+    except Exception:
+      self._log.error("Batch write FAILED, dropping {:d} points".format(len(batch)))
+      return False
+
   def sendPoints(self, measurement, tags, linestring, time=None):
     """Send a set of data points to database (data in linestring 'key1=value1,key2=value2' format)."""
     # Formulate influxDB line protocol.
@@ -66,46 +167,77 @@ class InfluxSender:
       dbstring = "{:s} {:s} {:d}".format(measurement, linestring, timestamp_ns)
     else:
       dbstring = "{:s},{:s} {:s} {:d}".format(measurement, tagstring, linestring, timestamp_ns)
-    self._log.debug("Sending: " + dbstring)
-    # Send it to the database.
-    return self.dbclient.write_points(dbstring, database=self.database, protocol=u'line')
+    self._log.debug("Sending: %s", dbstring)
+    # Buffer it for the database; N buffered records cost one HTTP round-trip.
+    return self._enqueue(dbstring)
 
   def sendDict(self, measurement, tags, recorddict, time=None):
     """Send a set of data points to database (data in dict key:value format)."""
     return self.sendPoints(measurement=measurement, tags=tags, linestring=InfluxSender.dict2lineformat(recorddict), time=time)
 
+  def prepare(self, measurement, tags=None):
+    """Return a bound sender with the 'measurement,tags' prefix precomputed.
+    For steady-state telemetry the measurement and tags are constant across
+    thousands of records; binding them once avoids re-serializing the tag
+    dict and reassembling the prefix on every send."""
+    tagstring = InfluxSender.dict2lineformat(tags, string_use_quotes=False)
+    if tagstring is None:
+      prefix = measurement
+    else:
+      prefix = "{:s},{:s}".format(measurement, tagstring)
+    return _BoundSender(self, prefix)
+
+  @staticmethod
   def timestamp(t=None):
     """Generate an influxdb timestamp from datetime object (if None, timestamp is generated for now)."""
-    if t == None:
-      t = datetime.datetime.utcnow()
-    return (t - datetime.datetime.utcfromtimestamp(0)).total_seconds()
+    return InfluxSender.timestamp_ns(t) / 1e9
 
+  @staticmethod
   def timestamp_ns(t=None):
     """Generate an influxdb nanoseconds timestamp from datetime object (if None, timestamp is generated for now)."""
-    return int(InfluxSender.timestamp(t)*1e9)
-
+    # time.time_ns() reads the clock directly; building datetime objects and
+    # subtracting an epoch constant costs far more per sample.
+    if t is None:
+      return time.time_ns()
+    if t.tzinfo is None:
+      # Naive datetimes are interpreted as UTC, as before.
+      t = t.replace(tzinfo=datetime.timezone.utc)
+    return int(t.timestamp() * 1e9)
+
+  @staticmethod
   def dict2lineformat(d, string_use_quotes=True):
-    report = ""
     if d is None:
       return None
+    # Pick the formatter table once, then dispatch per field on exact type.
+    # Building the fields in a list and joining once avoids the quadratic
+    # cost of repeated string concatenation on large records.
+    fmttable = _LINEFMT_QUOTED if string_use_quotes else _LINEFMT_UNQUOTED
+    fields = []
     for key in sorted(d):
-      if isinstance(d[key], float):
-        report = report + "{:s}={:0.7f},".format(key, d[key])
-      elif isinstance(d[key], int):
-        report = report + "{:s}={:d},".format(key, d[key])
-      elif isinstance(d[key], str):
-        if string_use_quotes:
-          report = report + "{:s}=\"{:s}\",".format(key, d[key])
-        else:
-          report = report + "{:s}={:s},".format(key, d[key])
-      elif d[key] is not None:
-        report = report + "{:s}={:},".format(key, d[key])
+      value = d[key]
+      if value is None:
+        # Value is None so leave it out of dataset.
+        continue
+      fmt = fmttable.get(type(value))
+      if fmt is not None:
+        fields.append(fmt(key, value))
       else:
-        # d[key] is None so leave it out of dataset.
-        pass
-    # Trim trailing comma.
-    report = report[0:-1]
-    return report
+        fields.append(_lineformatDefault(key, value, fmttable))
+    return ",".join(fields)
+
+class _BoundSender:
+  """Sender bound to a fixed measurement and tag set, see InfluxSender.prepare."""
+  __slots__ = ('_parent', '_prefix')
+
+  def __init__(self, parent, prefix):
+    self._parent = parent
+    self._prefix = prefix
+
+  def send(self, recorddict, time=None):
+    """Send a set of data points under the bound measurement and tags."""
+    linestring = InfluxSender.dict2lineformat(recorddict)
+    timestamp_ns = InfluxSender.timestamp_ns(time)
+    return self._parent._enqueue("{:s} {:s} {:d}".format(self._prefix, linestring, timestamp_ns))
 
 def main(argv):
   # test operation
@@ -1,2 +1,2 @@
 # Re-export the class for ergonomic convenience.
-from .pduSynaccess import pdu
+from .pduSynaccess import pdu, AsyncPdu
@@ -26,60 +26,141 @@ Example Usage:
   pdu.set(ch=2, state=False)
   pdu.set(ch=3, state=False)
   print("Channel state = " + str(pdu.get()))
+  pdu.close()
 
   # Create PDU with channel specified (tied to channel).
   pduCh = pduSynaccess.pdu(uri=HOST, ch=3)
   pduCh.on()
   time.sleep(1)
   pduCh.off()
+  pduCh.close()
 """
 
 # system
 import argparse
+import asyncio
 import logging
 import serial
 import socket
 import sys
 import time
 
+def _parseOutletStatus(replybytes):
+  """Extract the per-channel outlet states from a sysshow reply.
+  Returns None if the reply has no parseable outlet status section."""
+  # Decode the raw bytes exactly once.
+  # (This used to partition the str() repr of the bytes, which only worked
+  # because the repr happens to embed a literal backslash-r.)
+  replystring = replybytes.decode('ascii', errors='replace')
+  replystring = replystring.partition("Outlet Status")[2].partition("\r")[0]
+  replystring = replystring.partition(":")[2]
+  replystring = replystring.strip()
+  if not replystring:
+    return None
+  try:
+    return [int(x) for x in replystring.split(" ")]
+  except ValueError:
+    return None
+
 class pdu:
+  REPLY_TIMEOUT = 1.0
+  # Console prompt the device prints once a command has fully completed.
+  PROMPT = b'>'
+
   def __init__(self, uri, ch=None, port=23, loglevel=logging.ERROR):
     self._uri = uri
     self._port = port
     self._ch = ch
+    self._sock = None
     logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s', level=loglevel)
     self._log = logging.getLogger(__name__)
 
-  def operation(self, operation):
-    # Open TCP socket to device.
+  def open(self):
+    """Open TCP connection to the PDU, returns True on success."""
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.settimeout(4)
+    # Disable Nagle so the small command packets flush immediately instead of
+    # waiting (up to ~40ms) to be coalesced with a following segment.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
     try:
       sock.connect((str(self._uri), int(self._port)))
     except:
       self._log.error("Connection to {:s} FAILED".format(str(self._uri)))
-      return (False, "")
+      return False
+    self._sock = sock
+    return True
+
+  def close(self):
+    """Close TCP connection to the PDU."""
+    if self._sock is None:
+      return
+    # Send logout command to gracefully end the device session.
+    try:
+      self._sock.send('logout\r'.encode('utf-8'))
+    except OSError:
+      pass
+    self._sock.close()
+    self._sock = None
+
+  def operation(self, operation):
+    # The TCP connection is persistent across operations; reconnecting per
+    # operation costs a TCP handshake and session teardown each time.
+    # Open the connection here if the user has not already done so.
+    if self._sock is None:
+      if not self.open():
+        return (False, "")
+    # Drain any residual bytes from a previous operation so a stale reply
+    # left in the socket cannot be parsed as this operation's output.
+    try:
+      self._sock.settimeout(0)
+      while self._sock.recv(4096):
+        pass
+    except (BlockingIOError, socket.timeout):
+      pass
+    self._sock.settimeout(4)
     # Send operation.
-    self._log.debug("Sending operation: " + operation)
+    self._log.debug("Sending operation: %s", operation)
     opstring = '\r' + operation + '\r'
-    sock.send(opstring.encode('utf-8'))
-    # Send logout command to gracefully close socket connection.
-    sock.send('logout\r'.encode('utf-8'))
-    # Use brief delay to allow device to respond.
-    # Delay was increased to 300ms to work properly with slower 8ch Synaccess PDUs.
-    # TODO(pstang): Change this implementation to a continuous read looking for
-    # command echo response, up to a timeout value.
-    time.sleep(0.3)
-    # Capture the recevied data from session.
-    rxstring = sock.recv(4096)
-    sock.close()
+    opbytes = operation.encode('utf-8')
+    try:
+      self._sock.send(opstring.encode('utf-8'))
+    except OSError:
+      # Connection dropped (e.g. device-side idle logout), reconnect and retry.
+      self._sock.close()
+      self._sock = None
+      if not self.open():
+        return (False, "")
+      self._sock.send(opstring.encode('utf-8'))
+    # Read continuously looking for the command echo response, up to a timeout.
+    # This replaces a previous fixed 300ms delay which set a latency floor on
+    # every operation (slower 8ch Synaccess PDUs needed the full 300ms).
+    self._sock.settimeout(0.05)
+    rxbuffer = bytearray()
+    deadline = time.monotonic() + self.REPLY_TIMEOUT
+    while time.monotonic() < deadline:
+      try:
+        chunk = self._sock.recv(4096)
+      except socket.timeout:
+        continue
+      if not chunk:
+        # Connection closed by the device; drop it so the next operation reconnects.
+        self._sock.close()
+        self._sock = None
+        break
+      rxbuffer.extend(chunk)
+      # The reply is complete once the echo has arrived and the console
+      # prompt follows it; breaking on the echo alone would truncate query
+      # output (the device echoes the input before printing results).
+      if opbytes in rxbuffer and rxbuffer.rstrip().endswith(self.PROMPT):
+        break
+    rxstring = bytes(rxbuffer)
+    if self._sock is not None:
+      self._sock.settimeout(4)
     # Print data received.
-    self._log.debug("Received reply: " + str(rxstring))
+    self._log.debug("Received reply: %s", rxstring)
     # Verify that the operation was echoed, otherwise the operation failed.
-    if (str(operation) in str(rxstring)):
-      success = True
-    else:
-      success = False
+    # (Compare bytes directly; no decode needed on the reply.)
+    success = opbytes in rxstring
     return (success, rxstring)
 
   def command(self, cmd):
@@ -106,13 +187,10 @@ class pdu:
     if reply[0] is False:
       self._log.error("Get Ch => FAILED")
       return None
-    # Extract data from string reply.
-    replystring = str(reply[1])
-    replystring = replystring.partition("Outlet Status")[2].partition("\\r")[0]
-    replystring = replystring.partition(":")[2]
-    replystring = replystring.strip()
-    chstate = replystring.split(" ")
-    chstate = [int(x) for x in chstate]
+    chstate = _parseOutletStatus(reply[1])
+    if chstate is None:
+      self._log.error("Get Ch => FAILED (no outlet status in reply)")
+      return None
     # Reduce data to one channel if specified.
     if ch is not None:
       chstate = chstate[ch-1]
@@ -133,6 +211,175 @@ class pdu:
       ch = self._ch
     return self.set(ch, False)
 
+class AsyncPdu:
+  """Asyncio variant of pdu for driving several PDUs concurrently.
+
+  All operations are coroutines; the blocking socket wait of pdu becomes an
+  awaitable, so a fleet of M PDUs completes in max(per-op) instead of
+  M x per-op wall time.
+
+  Example Usage:
+
+    pdus = [pduSynaccess.AsyncPdu(uri=host) for host in HOSTS]
+    async def allOn():
+      await asyncio.gather(*[p.on(ch=1) for p in pdus])
+      await asyncio.gather(*[p.close() for p in pdus])
+    asyncio.run(allOn())
+  """
+  REPLY_TIMEOUT = 1.0
+  # Console prompt the device prints once a command has fully completed.
+  PROMPT = b'>'
+
+  def __init__(self, uri, ch=None, port=23, loglevel=logging.ERROR):
+    self._uri = uri
+    self._port = port
+    self._ch = ch
+    self._reader = None
+    self._writer = None
+    # Set when a reply was not cleanly framed; the next operation then
+    # drains leftover bytes before sending.
+    self._dirty = False
+    logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s', level=loglevel)
+    self._log = logging.getLogger(__name__)
+
+  async def open(self):
+    """Open TCP connection to the PDU, returns True on success."""
+    try:
+      self._reader, self._writer = await asyncio.open_connection(
+        str(self._uri), int(self._port))
+    except OSError:
+      self._log.error("Connection to {:s} FAILED".format(str(self._uri)))
+      return False
+    # Disable Nagle so the small command packets flush immediately instead of
+    # waiting (up to ~40ms) to be coalesced with a following segment.
+    sock = self._writer.get_extra_info('socket')
+    if sock is not None:
+      sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return True
+
+  async def close(self):
+    """Close TCP connection to the PDU."""
+    if self._writer is None:
+      return
+    # Send logout command to gracefully end the device session.
+    try:
+      self._writer.write('logout\r'.encode('utf-8'))
+      await self._writer.drain()
+    except OSError:
+      pass
+    self._writer.close()
+    try:
+      await self._writer.wait_closed()
+    except OSError:
+      pass
+    self._reader = None
+    self._writer = None
+    self._dirty = False
+
+  async def operation(self, operation):
+    # Open the connection here if the user has not already done so.
+    if self._writer is None:
+      if not await self.open():
+        return (False, "")
+    # Drain residual bytes only after a badly framed reply; a stale reply
+    # left in the stream would otherwise be parsed as this operation's
+    # output. Cleanly framed operations skip the drain, which would cost
+    # a fixed 10ms timeout wait per call. (wait_for with a zero timeout
+    # cancels the read before it can run, so a short timeout is needed to
+    # pick up already-buffered bytes.)
+    if self._dirty:
+      while True:
+        try:
+          stale = await asyncio.wait_for(self._reader.read(4096), timeout=0.01)
+        except asyncio.TimeoutError:
+          break
+        if not stale:
+          break
+      self._dirty = False
+    # Send operation.
+    self._log.debug("Sending operation: %s", operation)
+    opstring = '\r' + operation + '\r'
+    opbytes = operation.encode('utf-8')
+    self._writer.write(opstring.encode('utf-8'))
+    await self._writer.drain()
+    # Read continuously looking for the command echo response, up to a timeout.
+    rxbuffer = bytearray()
+    deadline = time.monotonic() + self.REPLY_TIMEOUT
+    while time.monotonic() < deadline:
+      try:
+        chunk = await asyncio.wait_for(self._reader.read(4096), timeout=0.05)
+      except asyncio.TimeoutError:
+        continue
+      if not chunk:
+        # Connection closed by the device; drop it so the next operation reconnects.
+        await self.close()
+        break
+      rxbuffer.extend(chunk)
+      # The reply is complete once the echo has arrived and the console
+      # prompt follows it; breaking on the echo alone would truncate query
+      # output (the device echoes the input before printing results).
+      if opbytes in rxbuffer and rxbuffer.rstrip().endswith(self.PROMPT):
+        break
+    rxstring = bytes(rxbuffer)
+    # A reply without the trailing prompt may still have bytes in flight;
+    # flag the stream so the next operation drains them first.
+    if self._writer is not None:
+      self._dirty = not (opbytes in rxbuffer and
+                         rxbuffer.rstrip().endswith(self.PROMPT))
+    # Print data received.
+    self._log.debug("Received reply: %s", rxstring)
+    # Verify that the operation was echoed, otherwise the operation failed.
+    success = opbytes in rxstring
+    return (success, rxstring)
+
+  async def command(self, cmd):
+    reply = await self.operation(cmd)
+    success = reply[0]
+    return success
+
+  async def set(self, ch, state):
+    """Set PDU channel to requested state."""
+    # Compose and send the operation.
+    offon = int(bool(state));
+    cmd = "pset {:d} {:d}".format(ch, offon)
+    success = await self.command(cmd)
+    self._log.info("Set Ch{:d}={:s} => {:s}".format(ch, ['OFF', 'ON'][offon], ['FAILED', 'OK'][success]))
+    return success
+
+  async def get(self, ch=None):
+    """Get PDU channel state."""
+    if ch is None:
+      ch = self._ch
+    # Compose and send the operation.
+    cmd = 'sysshow'
+    reply = await self.operation(cmd)
+    if reply[0] is False:
+      self._log.error("Get Ch => FAILED")
+      return None
+    chstate = _parseOutletStatus(reply[1])
+    if chstate is None:
+      self._log.error("Get Ch => FAILED (no outlet status in reply)")
+      return None
+    # Reduce data to one channel if specified.
+    if ch is not None:
+      chstate = chstate[ch-1]
+      self._log.info("Get Ch{:d}={:s}".format(ch, ['OFF', 'ON'][chstate]))
+    else:
+      self._log.info("Get Ch= " + str(chstate))
+    return chstate
+
+  async def on(self, ch=None):
+    """Set PDU channel ON."""
+    if ch is None:
+      ch = self._ch
+    return await self.set(ch, True)
+
+  async def off(self, ch=None):
+    """Set PDU channel OFF."""
+    if ch is None:
+      ch = self._ch
+    return await self.set(ch, False)
+
 def strBool(v):
   if isinstance(v, bool):
     return v
@@ -44,45 +44,104 @@ Example Usage:
 
 # system
 import argparse
+import json
 import math
 import logging
+import re
 import serial
 import socket
 import sys
+import threading
 import time
 
+# Configure logging once at import; calling basicConfig per instance would
+# re-attach handlers on the first instance and silently no-op afterwards.
+if not logging.getLogger().handlers:
+  logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s')
+
+# Terse-mode query replies look like '* 24.9,91,84,84'. The ack prefix is
+# stripped with a precompiled anchored pattern so only the leading '* ' is
+# removed, not coincidental occurrences later in the reply.
+_QUERY_ACK_RE = re.compile(r'^\*\s*')
+
+# Float field classifier for reply coercion. Checking the shape up front
+# avoids raising and catching ValueError per non-numeric field, which
+# otherwise dominates the parse cost of frequent telemetry polls.
+_FLOAT_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$')
+
 class ptu:
-  def __init__(self, serialport, baudrate=9600, timeout=5, loglevel=logging.ERROR):
+  # Pre-encoded byte strings for the fixed commands used repeatedly by scan
+  # loops, so their transmissions need no per-call formatting or encoding.
+  _CONST_OPS = {'S': b'S ', 'A': b'A ', 'I': b'I ', 'FT': b'FT '}
+
+  def __init__(self, serialport, baudrate=9600, timeout=5, cache_path=None, loglevel=logging.ERROR):
     self._ser = serial.Serial()
     self._ser.port = serialport
     self._ser.baudrate = baudrate
     self._ser.timeout = timeout
-    logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s', level=loglevel)
+    # Optional JSON file caching the device-constant parameters (limits,
+    # resolution) keyed by serial number, to skip their queries on open().
+    self._cache_path = cache_path
+    # Receive buffer holding bytes read past the current reply terminator
+    # (batched replies often arrive together in one read).
+    self._rxbuf = bytearray()
     self._log = logging.getLogger(__name__)
+    if loglevel is not None:
+      self._log.setLevel(loglevel)
 
   def open(self):
     """Open the communication port."""
     self._ser.open()
+    # Request low-latency mode from the kernel (ASYNC_LOW_LATENCY). USB-UART
+    # bridges like FTDI otherwise batch received bytes behind a 16ms latency
+    # timer, which dominates the round-trip time of short replies.
+    try:
+      self._ser.set_low_latency_mode(True)
+    except (AttributeError, ValueError, OSError):
+      # Not supported on all platforms/drivers.
+      pass
     self.deviceInit()
 
   def close(self):
     """Close the communication port."""
     self._ser.close()
 
-  def serialWrite(self, string):
-    """Write string to serial device."""
-    self._log.debug("Serial Tx: \'{:s}\'".format(string))
-    self._ser.write(string.encode())
+  def serialWrite(self, data):
+    """Write string or bytes to serial device."""
+    if not isinstance(data, bytes):
+      data = data.encode()
+    self._log.debug("Serial Tx: '%s'", data)
+    self._ser.write(data)
     return
 
   def serialRead(self, maxchars):
     """Read string from serial device."""
-    #string = self._ser.read(maxchars).decode('utf-8')
-    string = self._ser.read_until(b'\n')
-    string = string.decode('utf-8')
-    self._log.debug("Serial Rx: \'{:s}\'".format(string))
+    string = self._readline()
+    self._log.debug("Serial Rx: '%s'", string)
     return string
 
+  def _readline(self):
+    """Read one newline-terminated reply, decoded to str.
+    read_until polls the port byte-by-byte; reading in_waiting bytes at a
+    time collects a buffered reply in one or two syscalls instead. Bytes
+    past the terminator (the rest of a batched reply) stay buffered for
+    the next call. The line is decoded off a memoryview of the reused
+    buffer, so no intermediate bytes object is allocated per reply."""
+    buf = self._rxbuf
+    while True:
+      i = buf.find(b'\n')
+      if i >= 0:
+        line = str(memoryview(buf)[:i + 1], 'utf-8')
+        del buf[:i + 1]
+        return line
+      chunk = self._ser.read(max(1, self._ser.in_waiting))
+      if not chunk:
+        # Timed out without a terminator; return whatever arrived.
+        line = buf.decode('utf-8')
+        buf.clear()
+        return line
+      buf.extend(chunk)
+
   def deviceInit(self):
     """Initialize PTU for operations."""
     # Query information about the PTU.
@@ -91,9 +150,46 @@ class ptu:
     self._ptu_serialnumber = self.query('VS')
     # Set PTU to terse feedback mode.
     self.command('FT')
-    # Get parameters.
-    self.getLimitsNative()
-    self.getResolution()
+    # Get parameters. These are device constants, so a cache entry matching
+    # this serial number saves the round trips on every subsequent open().
+    if not self._cacheLoad():
+      self.getLimitsNative()
+      self.getResolution()
+      self._cacheSave()
+
+  def _cacheLoad(self):
+    """Load device-constant parameters from the cache file, returns success."""
+    if self._cache_path is None:
+      return False
+    try:
+      with open(self._cache_path) as f:
+        cache = json.load(f)
+    except (OSError, ValueError):
+      return False
+    if cache.get('serialnumber') != self._ptu_serialnumber:
+      return False
+    self._ptu_pan_limit = tuple(cache['pan_limit'])
+    self._ptu_tilt_limit = tuple(cache['tilt_limit'])
+    self._setResolution(cache['pan_resolution'], cache['tilt_resolution'])
+    self._log.info("deviceInit: parameters loaded from cache {:s}".format(self._cache_path))
+    return True
+
+  def _cacheSave(self):
+    """Save device-constant parameters to the cache file."""
+    if self._cache_path is None:
+      return
+    cache = {
+      'serialnumber': self._ptu_serialnumber,
+      'pan_limit': self._ptu_pan_limit,
+      'tilt_limit': self._ptu_tilt_limit,
+      'pan_resolution': self._ptu_pan_resolution,
+      'tilt_resolution': self._ptu_tilt_resolution,
+    }
+    try:
+      with open(self._cache_path, 'w') as f:
+        json.dump(cache, f)
+    except OSError:
+      self._log.error("Could not write parameter cache {:s}".format(self._cache_path))
 
   def operation(self, operation):
     """
@@ -104,30 +200,83 @@ class ptu:
       reply str: the reply string from the PTU
     :rtype: tuple
     """
-    # Send operation.
-    self._log.debug("Sending operation: \'{:s}\'".format(operation))
-    txstring = operation + ' '
-    self.serialWrite(txstring)
-    # Use brief delay to allow device to respond.
-    #time.sleep(0.05)
-    # Capture the recevied data from session.
-    rxstring = self.serialRead(1024)
+    return self.operationMulti([operation])[0]
+
+  def operationMulti(self, operations):
+    """
+    Perform multiple operations on the PTU in a single transmission.
+    :param list operations: the operation strings
+    :return list of (success, reply) tuples, one per operation
+    :rtype: list
+    """
+    # Send all operations in one write. The PTU executes and answers them in
+    # order, so each reply can be read back as its own terminated line.
+    # This pays the serial round-trip latency once per batch, not per command.
+    # Constant ops come pre-encoded from the table; parameterized ops are
+    # encoded here once, so the write itself needs no further conversion.
+    txbytes = b''.join(
+      [ptu._CONST_OPS.get(op) or (op + ' ').encode() for op in operations])
+    self._log.debug("Sending operation: '%s'", txbytes)
+    self.serialWrite(txbytes)
+    results = []
+    for op in operations:
+      # Capture the recevied data from session.
+      rxstring = self.serialRead(1024)
+      results.append(self._verifyReply(op, rxstring))
+    return results
+
+  def _verifyReply(self, operation, rxstring):
+    """Verify the echoed reply line for one operation, returns (success, reply)."""
+    opecho = operation + ' '
     # Strip off <CR><LF>
     rxstring = str(rxstring).strip()
     # Verify that the operation was echoed, otherwise the operation failed.
     success = False
     reply = None
-    if rxstring.startswith(txstring):
-      # Strip off echoed command to get reply.
-      #reply = rxstring.rstrip(txstring)
-      reply = rxstring.replace(txstring, '')
-      #print("REPLY: " + reply)
-      if reply[0] is '*':
-        success = True
+    if rxstring.startswith(opecho):
+      # Slice off the echoed command to get the reply. (A replace() here
+      # would also clobber coincidental occurrences of the command text
+      # later in the reply, besides scanning the whole string.)
+      reply = rxstring[len(opecho):]
+      success = reply.startswith('*')
     # Print data received.
-    self._log.debug("Received reply: \'{:s}\' => {:s}".format(reply, ['FAILED', 'OK'][success]))
+    self._log.debug("Received reply: '%s' => %s", reply, ['FAILED', 'OK'][success])
     return (success, reply)
 
+  async def openAsync(self):
+    """Open the communication port for asyncio use (alternative to open()).
+    Requires the pyserial-asyncio package."""
+    # Imported here so the asyncio path stays optional.
+    import serial_asyncio
+    (self._areader, self._awriter) = await serial_asyncio.open_serial_connection(
+      url=self._ser.port, baudrate=self._ser.baudrate)
+
+  async def closeAsync(self):
+    """Close the asyncio communication port."""
+    self._awriter.close()
+    self._areader = None
+    self._awriter = None
+
+  async def operationAsync(self, operation):
+    """
+    Asyncio variant of operation(), so several serial devices can be driven
+    concurrently from one event loop. Open the port with openAsync() first.
+    """
+    return (await self.operationMultiAsync([operation]))[0]
+
+  async def operationMultiAsync(self, operations):
+    """Asyncio variant of operationMulti()."""
+    txbytes = b''.join(
+      [ptu._CONST_OPS.get(op) or (op + ' ').encode() for op in operations])
+    self._log.debug("Sending operation: '%s'", txbytes)
+    self._awriter.write(txbytes)
+    await self._awriter.drain()
+    results = []
+    for op in operations:
+      rxbytes = await self._areader.readuntil(b'\n')
+      results.append(self._verifyReply(op, rxbytes.decode('utf-8')))
+    return results
+
   def command(self, cmd, args=[]):
     """
     Perform a command on the PTU.
@@ -136,36 +285,47 @@ class ptu:
     :return: whether the command was successful
     :rtype: bool
     """
-    opstr = "{:s}".format(cmd)
-    for arg in args:
-      opstr = opstr + "{:d}".format(arg)
+    # Join the arguments in one pass; repeated concatenation re-copies the
+    # growing string per argument.
+    opstr = cmd + ''.join(['{:d}'.format(arg) for arg in args])
     (success, reply) = self.operation(opstr)
     self._log.info("command: {:s} => {}".format(opstr, ['FAILED', 'OK'][success]))
     return success
 
+  def commandBatch(self, cmds):
+    """
+    Perform multiple commands on the PTU in a single transmission.
+    :param list cmds: the command strings, e.g. ['S', 'PP1000', 'TP200', 'A']
+    :return: whether all commands were successful
+    :rtype: bool
+    """
+    results = self.operationMulti(cmds)
+    success = all([r[0] for r in results])
+    self._log.info("commandBatch: {:} => {}".format(cmds, ['FAILED', 'OK'][success]))
+    return success
+
+  @staticmethod
+  def _coerce(field):
+    """Convert one reply field to int or float, or leave it as a string."""
+    # isdigit is the cheap integer fast path; floats are shape-checked to
+    # avoid the cost of a raised-and-caught ValueError per string field.
+    # Strip at most one leading '-': lstrip would accept line noise like
+    # '--3' and then crash int() instead of falling through to a string.
+    if (field[1:] if field.startswith('-') else field).isdigit():
+      return int(field)
+    if _FLOAT_RE.match(field):
+      return float(field)
+    return field
+
+  @staticmethod
   def queryParse(query_string):
     # Example '* 24.9,91,84,84'
-    query_result = None
     # With verbose feedback, there is no regular guaranteed query result format.
     # At open time, we set the feedback to terse.
     # This permits parsing fields with split.
-    # First drop the '* '.
-    query_string = query_string.replace('* ', '')
-    # Then split CSV fields.
-    query_result = query_string.split(',')
-    # Try to convert each field to int, or float, or leave as string
-    for n, v in enumerate(query_result):
-      try:
-        query_result[n] = int(query_result[n])
-      except ValueError:
-        try:
-          query_result[n] = float(query_result[n])
-        except ValueError:
-          pass
-    # TODO(pstang): Could probably do the above in a more pythonic way with map
-    # and a type converter.
-    #query_result = list(map(int, query_result))
-    return query_result
+    # First drop the '* ', then coerce each CSV field.
+    query_string = _QUERY_ACK_RE.sub('', query_string, count=1)
+    return list(map(ptu._coerce, query_string.split(',')))
 
   def query(self, cmd):
     """
@@ -183,29 +343,74 @@ class ptu:
     self._log.info("query: {:s} => {}".format(cmd, query_result))
     return query_result
 
+  def queryMulti(self, cmds):
+    """
+    Perform multiple queries on the PTU in a single transmission.
+    :param list cmds: the command strings, e.g. ['PP', 'TP']
+    :return: list of query results, one per command
+    :rtype: list
+    """
+    results = self.operationMulti(cmds)
+    query_results = []
+    for cmd, (success, reply) in zip(cmds, results):
+      query_result = None
+      if success is True:
+        # Parse query result
+        query_result = ptu.queryParse(reply)
+      self._log.info("query: {:s} => {}".format(cmd, query_result))
+      query_results.append(query_result)
+    return query_results
+
   def setPositionNative(self, pan, tilt):
     """Point PTU to requested pan and tilt (native units)."""
-    # Compose and send the operation.
-    success = self.command(cmd='S')
-    success = self.command(cmd='PP', args=[pan])
-    success = self.command(cmd='TP', args=[tilt])
-    success = self.command(cmd='A')
+    # Compose and send the command sequence as one transmission.
+    success = self.commandBatch(
+      ['S', 'PP{:d}'.format(pan), 'TP{:d}'.format(tilt), 'A'])
     self._log.info("setPositionNative: pan={:d} tilt={:d} => {:s}".format(pan, tilt, ['FAILED', 'OK'][success]))
     return success
 
+  def setPositionNativeAsync(self, pan, tilt):
+    """Start PTU motion to requested pan and tilt (native units) without
+    waiting for completion. Unlike setPositionNative, which blocks on the
+    'A' await command for the whole motion (possibly seconds), this sets
+    immediate mode and returns as soon as the move is accepted, leaving
+    the serial link free to overlap other work. Use awaitPosition() when
+    the motion must be finished. (Regular method, not a coroutine; see
+    operationAsync for the asyncio path.)"""
+    # Compose and send the command sequence as one transmission.
+    success = self.commandBatch(
+      ['I', 'PP{:d}'.format(pan), 'TP{:d}'.format(tilt)])
+    self._log.info("setPositionNativeAsync: pan={:d} tilt={:d} => {:s}".format(pan, tilt, ['FAILED', 'OK'][success]))
+    return success
+
+  def awaitPosition(self, pan, tilt, tol=5, interval=0.05, timeout=30):
+    """Poll until the PTU is within <tol> native units of (pan, tilt).
+    Returns True when the position is reached, False on timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+      (pan_now, tilt_now) = self.getPositionNative()
+      if abs(pan_now - pan) <= tol and abs(tilt_now - tilt) <= tol:
+        return True
+      if time.monotonic() >= deadline:
+        self._log.error("awaitPosition: pan={:d} tilt={:d} => TIMEOUT at pan={:d} tilt={:d}".format(pan, tilt, pan_now, tilt_now))
+        return False
+      time.sleep(interval)
+
   def getPositionNative(self):
     """Get current PTU pan and tilt position (native units)."""
-    # Compose and send the operation.
-    pan = self.query(cmd='PP')[0]
-    tilt = self.query(cmd='TP')[0]
+    # Compose and send both queries as one transmission.
+    (pan_result, tilt_result) = self.queryMulti(['PP', 'TP'])
+    pan = pan_result[0]
+    tilt = tilt_result[0]
     self._log.info("getPositionNative: pan={:d} tilt={:d}".format(pan, tilt))
     return (pan, tilt)
 
   def getLimitsNative(self):
     """Get PTU pan and tilt limits (native units)."""
-    # Compose and send the operation.
-    self._ptu_pan_limit = (self.query('PN')[0], self.query('PX')[0])
-    self._ptu_tilt_limit = (self.query('TN')[0], self.query('TX')[0])
+    # Compose and send all four queries as one transmission.
+    (pan_min, pan_max, tilt_min, tilt_max) = self.queryMulti(['PN', 'PX', 'TN', 'TX'])
+    self._ptu_pan_limit = (pan_min[0], pan_max[0])
+    self._ptu_tilt_limit = (tilt_min[0], tilt_max[0])
     self._log.info("getLimitsNative: pan={:} tilt={:}".format(
       self._ptu_pan_limit, self._ptu_tilt_limit))
     return (self._ptu_pan_limit, self._ptu_tilt_limit)
@@ -214,16 +419,25 @@ class ptu:
     """Get current PTU pan and tilt resolution (radians/native unit)."""
     # Compose and send the operation.
     # Query returns arc-seconds per step. 1arc-sec * pi/(180 * 3600)
-    self._ptu_pan_resolution = self.query(cmd='PR')[0] * math.pi / (180 * 3600)
-    self._ptu_tilt_resolution = self.query(cmd='TR')[0] * math.pi / (180 * 3600)
+    self._setResolution(self.query(cmd='PR')[0] * math.pi / (180 * 3600),
+                        self.query(cmd='TR')[0] * math.pi / (180 * 3600))
     self._log.info("getResolution: pan={:f} tilt={:f}".format(self._ptu_pan_resolution, self._ptu_tilt_resolution))
     return (self._ptu_pan_resolution, self._ptu_tilt_resolution)
 
+  def _setResolution(self, pan_resolution, tilt_resolution):
+    """Store axis resolutions and precompute the conversion reciprocals."""
+    self._ptu_pan_resolution = pan_resolution
+    self._ptu_tilt_resolution = tilt_resolution
+    # Precompute the reciprocals once so the per-move radians-to-native
+    # conversion is a single multiply instead of a divide.
+    self._ptu_pan_native_per_radian = 1.0 / pan_resolution
+    self._ptu_tilt_native_per_radian = 1.0 / tilt_resolution
+
   def setPositionRadians(self, pan, tilt):
     """Point PTU to requested pan and tilt (radians)."""
     # Compose and send the operation.
-    pan_native = int(pan / self._ptu_pan_resolution)
-    tilt_native = int(tilt / self._ptu_tilt_resolution)
+    pan_native = int(pan * self._ptu_pan_native_per_radian)
+    tilt_native = int(tilt * self._ptu_tilt_native_per_radian)
     success = self.setPositionNative(pan_native, tilt_native)
     self._log.info("setPositionRadians: pan={:f} tilt={:f} => {:s}".format(pan, tilt, ['FAILED', 'OK'][success]))
     return success
@@ -237,6 +451,48 @@ class ptu:
     self._log.info("setPositionDegrees: pan={:f} tilt={:f} => {:s}".format(pan, tilt, ['FAILED', 'OK'][success]))
     return success
 
+  def trackingStart(self):
+    """Start the tracking worker thread (see setTargetDegrees)."""
+    self._track_target = None
+    self._track_stop = False
+    self._track_cv = threading.Condition()
+    self._track_worker = threading.Thread(target=self._trackLoop, daemon=True)
+    self._track_worker.start()
+
+  def trackingStop(self):
+    """Stop the tracking worker thread (sends a pending target first)."""
+    with self._track_cv:
+      self._track_stop = True
+      self._track_cv.notify()
+    self._track_worker.join()
+
+  def setTargetDegrees(self, pan, tilt):
+    """Hand (pan, tilt) degrees to the tracking worker and return immediately.
+    The worker holds a single-slot 'latest target' box: a new target
+    overwrites any still-pending one, so a burst of N updates from a
+    teleop/tracking producer collapses into one actual move command
+    instead of queueing N serial round-trips the PTU cannot keep up with.
+    Call trackingStart() first."""
+    with self._track_cv:
+      self._track_target = (pan, tilt)
+      self._track_cv.notify()
+
+  def _trackLoop(self):
+    """Tracking worker: drain the latest target and send it."""
+    while True:
+      with self._track_cv:
+        self._track_cv.wait_for(
+          lambda: self._track_target is not None or self._track_stop)
+        if self._track_target is None:
+          # Stop requested with nothing pending.
+          return
+        target = self._track_target
+        self._track_target = None
+        stop = self._track_stop
+      self.setPositionDegrees(target[0], target[1])
+      if stop:
+        return
+
   def setPositionAzEl(self, azimuth, elevation):
     """Point PTU to requested Azimuth and Elevation (radians)."""
     # Compose and send the operation.
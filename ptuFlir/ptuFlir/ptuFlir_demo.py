@@ -38,20 +38,9 @@ def ptuQueryOperations(ptu):
 def ptuBasicOperations(ptu):
   ptu.query(cmd='PP')
   ptu.query(cmd='TP')
-  ptu.command(cmd='I')
-  ptu.command(cmd='PP', args=[1000])
-  ptu.command(cmd='A')
-  ptu.command(cmd='PP', args=[-1000])
-  ptu.command(cmd='A')
-  ptu.command(cmd='PP', args=[0])
-  ptu.command(cmd='A')
-
-  ptu.command(cmd='TP', args=[1000])
-  ptu.command(cmd='A')
-  ptu.command(cmd='TP', args=[-1000])
-  ptu.command(cmd='A')
-  ptu.command(cmd='TP', args=[0])
-  ptu.command(cmd='A')
+  # Each batch goes out as a single transmission.
+  ptu.commandBatch(['I', 'PP1000', 'A', 'PP-1000', 'A', 'PP0', 'A'])
+  ptu.commandBatch(['TP1000', 'A', 'TP-1000', 'A', 'TP0', 'A'])
 
 def ptuPositionOperations(ptu):
   ptu.setPositionDegrees(90,10)
@@ -77,6 +66,23 @@ def ptuBoxScan(ptu, pan_width, tilt_width):
   print(ptu.getPositionNative())
   pass
 
+def ptuRasterScan(ptu, pan_width, tilt_width, steps):
+  """Raster-scan a steps x steps grid of waypoints (native units).
+  The waypoints are generated as one NumPy array and the whole command
+  sequence goes out as a single transmission, so the grid costs one write
+  plus the echo reads instead of a serial round-trip per waypoint."""
+  # Imported here so NumPy stays optional; only this scan uses it.
+  import numpy as np
+  pans = np.linspace(-pan_width, pan_width, steps, dtype=np.int32)
+  tilts = np.linspace(-tilt_width, tilt_width, steps, dtype=np.int32)
+  pts = np.stack(np.meshgrid(pans, tilts), -1).reshape(-1, 2)
+  cmds = []
+  for (pan, tilt) in pts:
+    cmds += ['S', 'PP{:d}'.format(pan), 'TP{:d}'.format(tilt), 'A']
+  ptu.commandBatch(cmds)
+  # Return home.
+  ptu.setPositionNative(0, 0)
+
 def main():
   # Create instance.
   # Set a high logging level so we can see our operations.
@@ -96,6 +102,8 @@ def main():
   ptuBasicOperations(ptu)
   ptuPositionOperations(ptu)
   ptuBoxScan(ptu, 10, 10)
+  # Raster scan (run only when needed, moves through the whole grid).
+  #ptuRasterScan(ptu, 1000, 300, 5)
 
   # Close the channel.
   ptu.close()
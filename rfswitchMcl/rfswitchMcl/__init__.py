@@ -1,2 +1,2 @@
-# Re-export the class for ergonomic convenience.
-from .rfswitchMcl import rfswitch
+# Re-export the classes for ergonomic convenience.
+from .rfswitchMcl import rfswitch, rfswitchHttp
@@ -64,17 +64,48 @@ Example Usage:
 # system
 import argparse
 import logging
-import parse
+import re
 import socket
 import sys
 import time
 import usb.core
 import usb.util
 
+# Model number pattern, compiled once at import. Captures switches, poles,
+# states and type from e.g. RC-2SP6T-A12 or USB-1SP8T-852H.
+_MODEL_RE = re.compile(r'^(?:RC|USB)-(\d+)([A-Z])P(\d+)T-(.+)$')
+
+# Field classifiers for reply coercion. Checking the shape up front avoids
+# raising and catching a ValueError per non-numeric field (model and serial
+# strings would otherwise raise twice on every query).
+_INT_RE = re.compile(r'-?\d+$')
+_FLT_RE = re.compile(r'-?\d+(\.\d*)?([eE][+-]?\d+)?$')
+
+# Configure logging once at import; calling basicConfig per instance would
+# re-attach handlers on the first instance and silently no-op afterwards.
+if not logging.getLogger().handlers:
+  logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s')
+
 
 class rfswitch:
+  # Fixed attribute layout: drops the per-instance __dict__, which shrinks
+  # memory and speeds up the attribute lookups on the per-command hot path.
+  __slots__ = ('_device', '_port', '_switch', '_sock', '_sock_last_used',
+               '_log', '_devUsb', 'model', 'serialnumber', 'switches',
+               'poles', 'states', '_cmd_read', '_cmd_write',
+               '_cache', '_cache_ttl', '_ep_out', '_ep_in',
+               '_rxbuf', '_rxview')
+
   NET_OPERATION_TERMINATOR = '\r\n'
   NET_REPLY_TERMINATOR = '\n\r'
+  # Pre-encoded byte forms of the protocol constants, used on the
+  # per-operation send/receive hot path so nothing fixed is re-encoded.
+  NET_OPERATION_TERMINATOR_B = b'\r\n'
+  NET_REPLY_TERMINATOR_B = b'\n\r'
+  USB_OPERATION_PREFIX_B = b'*:'
+  # Retire connections idle longer than this; the device drops idle sessions
+  # server-side and a proactive reconnect is cheaper than a mid-op stall.
+  NET_IDLE_TIMEOUT = 60
   USB_ENDPOINT_WRITE = 0x01
   USB_ENDPOINT_READ = 0x81
 
@@ -82,8 +113,17 @@ class rfswitch:
     self._device = device
     self._port = 23
     self._switch = switch
-    logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s', level=loglevel)
+    self._sock = None
+    # Short TTL cache over state reads; see get().
+    self._cache = {}
+    self._cache_ttl = 0.1
+    # Reusable receive buffer for operationNet; replies are received into
+    # it in place so the recv path allocates nothing per operation.
+    self._rxbuf = bytearray(4096)
+    self._rxview = memoryview(self._rxbuf)
     self._log = logging.getLogger(__name__)
+    if loglevel is not None:
+      self._log.setLevel(loglevel)
 
   def open(self):
     """Open the communication port."""
@@ -94,24 +134,51 @@ class rfswitch:
       self._devUsb = usb.core.find(idVendor=0x20CE, idProduct=0x0022)
       if self._devUsb is None:
         raise ValueError('USB device not found')
-      for configuration in self._devUsb:
-        for interface in configuration:
-          ifnum = interface.bInterfaceNumber
-          if not self._devUsb.is_kernel_driver_active(ifnum):
-            continue
-          try:
-            self._devUsb.detach_kernel_driver(ifnum)
-          except (usb.core.USBError):
-            pass
+      # These HID switches expose exactly one interface (0); address it
+      # directly instead of walking every configuration descriptor, which
+      # costs a libusb round trip per interface on each open().
+      try:
+        if self._devUsb.is_kernel_driver_active(0):
+          self._devUsb.detach_kernel_driver(0)
+      except (usb.core.USBError):
+        pass
       # Set the active configuration.
       # No args selects the first config.
       self._devUsb.set_configuration()
+      usb.util.claim_interface(self._devUsb, 0)
+      # Cache the endpoint objects; writing/reading through them directly
+      # skips pyusb's device-to-endpoint resolution on every transaction.
+      intf = self._devUsb.get_active_configuration()[(0, 0)]
+      self._ep_out = usb.util.find_descriptor(
+        intf, custom_match=lambda e: e.bEndpointAddress == self.USB_ENDPOINT_WRITE)
+      self._ep_in = usb.util.find_descriptor(
+        intf, custom_match=lambda e: e.bEndpointAddress == self.USB_ENDPOINT_READ)
+    else:
+      # Open a persistent TCP connection to the device. Reconnecting per
+      # operation would cost a TCP handshake for every single command.
+      self._netOpen()
     # Query and initialize the RF switch.
     self.deviceInit()
 
   def close(self):
     """Close the communication port."""
-    pass
+    if self._sock is not None:
+      self._sock.close()
+      self._sock = None
+
+  def _netOpen(self):
+    """Open the TCP connection to the device (raises OSError on failure)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(2)
+    # Disable Nagle so the small SCPI packets flush immediately.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # Keepalive probes detect a dead peer during long test sequences.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+      sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+    sock.connect((str(self._device), int(self._port)))
+    self._sock = sock
+    self._sock_last_used = time.monotonic()
 
   def deviceInit(self):
     """Initialize the RF switch operations."""
@@ -124,44 +191,105 @@ class rfswitch:
     #   RC-2SP6T-A12
     #   USB-8SPDT-A18
     #   USB-1SP8T-852H
-    if self.model.startswith("RC"):
-      fields = parse.parse("RC-{switches:d}{poles:l}P{states:d}T-{type}", self.model)
-    elif self.model.startswith("USB"):
-      fields = parse.parse("USB-{switches:d}{poles:l}P{states:d}T-{type}", self.model)
-    else:
+    fields = _MODEL_RE.match(self.model)
+    if fields is None:
       raise ValueError('Unsupported HW model')
-    self.switches = fields['switches']
-    self.poles = fields['poles']
-    self.states = fields['states']
+    self.switches = int(fields[1])
+    self.poles = fields[2]
+    self.states = int(fields[3])
     self._log.info("RF Switch \'{:s}\' has: {} switches, {} poles, {} states".format(
       self.model, self.switches, self.poles, self.states))
+    # Precompute the per-switch SCPI command strings (read and write) so
+    # set/get reduce to a dict lookup plus one %d substitution instead of
+    # re-running the branching and format parsing on every command.
+    self._cmd_read = {}
+    self._cmd_write = {}
+    # If there is only one switch, the switch argument is omitted.
+    letters = [''] if self.switches == 1 else [chr(n + 65) for n in range(self.switches)]
+    for letter in letters:
+      if self.states in [2, 'D']:
+        # Example commands:
+        #   Read : SETA
+        #   Write: SETA=3
+        self._cmd_read[letter] = "SET{:}".format(letter)
+        self._cmd_write[letter] = "SET{:}=%d".format(letter)
+      elif 4 <= self.states <= 16:
+        # Example commands:
+        #   Read : SP8T:STATE
+        #   Write: SP8T:STATE:3
+        self._cmd_read[letter] = "SP{:}T{:}:STATE".format(self.states, letter)
+        self._cmd_write[letter] = "SP{:}T{:}:STATE:%d".format(self.states, letter)
+    # Fail at init for unsupported devices, not on the first command.
+    if not self._cmd_read:
+      raise ValueError('Unsupported states/throws')
 
   def operationNet(self, operation):
     # Examples:
     #  'MN?\r\n'           => '\r\nMN=RC-2SP6T-A12\n\r'
     #  'SN?\r\n'           => '\r\nSN=11710240017\n\r'
     #  'SP6TA:STATE:1\r\n' => '\r\n1\n\r'
-    # Open TCP socket to device.
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(2)
+    # Retire a connection that has sat idle past the eviction window.
+    if (self._sock is not None and
+        time.monotonic() - self._sock_last_used > self.NET_IDLE_TIMEOUT):
+      self._sock.close()
+      self._sock = None
+    # Connect on demand if open() was not called yet.
+    if self._sock is None:
+      try:
+        self._netOpen()
+      except OSError:
+        self._log.error("Connection to {:s} FAILED".format(str(self._device)))
+        return (False, "")
+    # Bind the hot lookups once per operation; each self.x.y attribute
+    # chain costs two dict walks per call.
+    log_debug = self._log.debug
+    # Send operation (only the variable part needs encoding).
+    txbytes = operation.encode('utf-8') + self.NET_OPERATION_TERMINATOR_B
+    log_debug("SendingStr: '%s'", txbytes)
     try:
-      sock.connect((str(self._device), int(self._port)))
-    except:
-      self._log.error("Connection to {:s} FAILED".format(str(self._device)))
-      return (False, "")
-    # Send operation.
-    txstring = operation + self.NET_OPERATION_TERMINATOR
-    self._log.debug("SendingStr: \'{:}\'".format(txstring))
-    sock.send(txstring.encode('utf-8'))
-    # Send logout command to gracefully close socket connection.
-    #sock.send('logout\r'.encode('utf-8'))
-    # Use brief delay to allow device to respond.
-    time.sleep(0.05)
-    # Capture the recevied data from session.
-    rxstring = sock.recv(1024)
-    rxstring = rxstring.decode()
-    sock.close()
-    self._log.debug("ReceivedStr: \'{:}\'".format(rxstring))
+      self._sock.sendall(txbytes)
+    except OSError:
+      # Connection dropped (e.g. device closed an idle session), reconnect
+      # and retry the send once.
+      self._sock.close()
+      self._sock = None
+      try:
+        self._netOpen()
+        self._sock.sendall(txbytes)
+      except OSError:
+        self._log.error("Connection to {:s} FAILED".format(str(self._device)))
+        return (False, "")
+    # Read until the reply terminator arrives. The device frames every reply,
+    # so a fixed settling delay is not needed; the socket timeout bounds the
+    # wait if the device never answers.
+    buf = self._rxbuf
+    view = self._rxview
+    terminator = self.NET_REPLY_TERMINATOR_B
+    # Bound after the send block so a reconnect is picked up.
+    recv_into = self._sock.recv_into
+    off = 0
+    try:
+      while not buf.endswith(terminator, 0, off):
+        if off == len(buf):
+          # Reply overflows the buffer; treat it as a framing failure.
+          break
+        n = recv_into(view[off:])
+        if n == 0:
+          break
+        off += n
+    except socket.timeout:
+      pass
+    rxstring = str(view[:off], 'utf-8')
+    if buf.endswith(terminator, 0, off):
+      self._sock_last_used = time.monotonic()
+    else:
+      # Framing failed (timeout, short read or overflow). The reply's tail
+      # may still arrive later and would be read as the start of the next
+      # operation's reply, returning stale data from then on; drop the
+      # connection so the next operation starts on a clean stream.
+      self._sock.close()
+      self._sock = None
+    log_debug("ReceivedStr: '%s'", rxstring)
     # Verify that the operation is framed, otherwise the operation failed.
     success = False
     reply = None
@@ -184,21 +312,23 @@ class rfswitch:
     #  '*:SP8T:STATE:0' => '*0' (failed)
     #  '*:SP8T:STATE:1' => '*1' (success)
     #  '*:SP8T:STATE:2' => '*2' (success)
-    txstring = "*:" + operation
-    self._log.debug("SendingStr: \'{:}\'".format(txstring))
-    self._devUsb.write(self.USB_ENDPOINT_WRITE, txstring)
-    rxdata = self._devUsb.read(self.USB_ENDPOINT_READ, 64)
-    rxstring = ""
-    for byte in rxdata:
-      if (byte > 0 and byte < 255):
-        rxstring = rxstring + chr(byte)
-      else:
-        break
-    self._log.debug("ReceivedStr: \'{:}\'".format(rxstring))
+    # Bind the hot lookups once per operation.
+    log_debug = self._log.debug
+    # Send pre-encoded bytes; pyusb would otherwise encode the str per call.
+    txbytes = self.USB_OPERATION_PREFIX_B + operation.encode('ascii')
+    log_debug("SendingStr: '%s'", txbytes)
+    self._ep_out.write(txbytes)
+    rxdata = self._ep_in.read(64)
+    # Trim at the first 0x00/0xFF pad byte and decode in one pass; the old
+    # per-byte chr() loop re-copied the growing string for every byte of
+    # the 64-byte report.
+    raw = bytes(rxdata).split(b'\x00', 1)[0].split(b'\xff', 1)[0]
+    rxstring = raw.decode('ascii', 'ignore')
+    log_debug("ReceivedStr: '%s'", rxstring)
     # Verify that the operation is framed, otherwise the operation failed.
     success = False
     reply = None
-    if rxstring.startswith(txstring[0]):
+    if rxstring.startswith('*'):
       rxstring = rxstring[1:]
       reply = operation + '=' + rxstring
       success = True
@@ -216,16 +346,15 @@ class rfswitch:
       txstring = ')'
     else:
       txstring = "*:" + operation
-    self._log.debug("SendingStr: \'{:}\'".format(txstring))
-    self._devUsb.write(self.USB_ENDPOINT_WRITE, txstring)
-    rxdata = self._devUsb.read(self.USB_ENDPOINT_READ, 64)
-    rxstring = ""
-    for byte in rxdata:
-      if (byte > 0 and byte < 255):
-        rxstring = rxstring + chr(byte)
-      else:
-        break
-    self._log.debug("ReceivedStr: \'{:}\'".format(rxstring))
+    self._log.debug("SendingStr: '%s'", txstring)
+    self._ep_out.write(txstring)
+    rxdata = self._ep_in.read(64)
+    # Trim at the first 0x00/0xFF pad byte and decode in one pass; the old
+    # per-byte chr() loop re-copied the growing string for every byte of
+    # the 64-byte report.
+    raw = bytes(rxdata).split(b'\x00', 1)[0].split(b'\xff', 1)[0]
+    rxstring = raw.decode('ascii', 'ignore')
+    self._log.debug("ReceivedStr: '%s'", rxstring)
     # Verify that the operation is framed, otherwise the operation failed.
     success = False
     reply = None
@@ -245,13 +374,13 @@ class rfswitch:
     :rtype: tuple
     """
     # Send operation.
-    self._log.debug("Sending operation: \'{:s}\'".format(operation))
+    self._log.debug("Sending operation: '%s'", operation)
     if self._device.startswith('usb'):
       (success, reply) = self.operationUsb(operation)
     else:
       (success, reply) = self.operationNet(operation)
     # Print data received.
-    self._log.debug("Received reply: \'{:}\' => {:s}".format(reply, ['FAILED', 'OK'][success]))
+    self._log.debug("Received reply: '%s' => %s", reply, ['FAILED', 'OK'][success])
     return (success, reply)
 
   def commandComposeScpi(self, state, switch=None):
@@ -262,7 +391,7 @@ class rfswitch:
     :return: the SCPI command
     :rtype: str
     """
-    # Handle switch argument.
+    # Normalize the switch argument to the table key.
     if switch is None:
       switch = self._switch
     if isinstance(switch, int):
@@ -270,40 +399,24 @@ class rfswitch:
     # If there is only one switch, omit the argument.
     if self.switches == 1:
       switch = ''
-    # Handle composition based on states.
-    if self.states in [2, 'D']:
-      # Example commands:
-      #   Read : SETA
-      #   Write: SETA=3
-      if state == None:
-        cmd = "SET{:}".format(switch)
-      else:
-        cmd = "SET{:}={:d}".format(switch, int(state))
-    elif self.states in range(4, 17):
-      # Example commands:
-      #   Read : SP8T:STATE
-      #   Write: SP8T:STATE:3
-      if state == None:
-        cmd = "SP{:}T{:}:STATE".format(self.states, switch)
-      else:
-        cmd = "SP{:}T{:}:STATE:{:d}".format(self.states, switch, int(state))
     else:
+      switch = str(switch).upper()
+    # Look up the precomputed command string (built in deviceInit).
+    tmpl = (self._cmd_read if state is None else self._cmd_write).get(switch)
+    if tmpl is None:
       raise ValueError('Unsupported states/throws')
-    return cmd
+    return tmpl if state is None else tmpl % int(state)
 
+  @staticmethod
   def replyParse(reply_string):
-    reply_result = None
     # Split on '='.
     reply_result = reply_string.split('=')
-    # Try to convert each field to int, or float, or leave as string
+    # Convert each field to int, or float, or leave as string.
     for n, v in enumerate(reply_result):
-      try:
-        reply_result[n] = int(reply_result[n])
-      except ValueError:
-        try:
-          reply_result[n] = float(reply_result[n])
-        except ValueError:
-          pass
+      if _INT_RE.match(v):
+        reply_result[n] = int(v)
+      elif _FLT_RE.match(v):
+        reply_result[n] = float(v)
     return reply_result
 
   def command(self, cmd, args=[]):
@@ -314,9 +427,9 @@ class rfswitch:
     :return: whether the command was successful
     :rtype: bool
     """
-    opstr = "{:s}".format(cmd)
-    for arg in args:
-      opstr = opstr + "{:d}".format(arg)
+    # Join the arguments in one pass; repeated concatenation re-copies the
+    # growing string per argument.
+    opstr = cmd + ''.join(['{:d}'.format(arg) for arg in args])
     (success, reply) = self.operation(opstr)
     if success is True:
       # Parse query results
@@ -355,9 +468,37 @@ class rfswitch:
     # Compose and send the operation.
     cmd = self.commandComposeScpi(state, switch)
     success = self.command(cmd)
+    # Drop any cached read of the switch just set.
+    self._cache.pop(self.commandComposeScpi(None, switch), None)
     self._log.info("Set Sw{:}={:d} => {:s}".format(switch, state, ['FAILED', 'OK'][success]))
     return success
 
+  def setMany(self, states):
+    """
+    Set several RF switches in one compound SCPI operation.
+    The per-switch commands are joined with ';' and sent as a single
+    transmission, so updating N switches costs one bus round trip instead
+    of N. You can use letter or number arguments for switch.
+    :param dict states: map of switch to desired state, e.g. {'A':1,'B':2}
+    :return: True if all commands were successful
+    :rtype: bool
+    """
+    parts = [self.commandComposeScpi(state, switch)
+             for (switch, state) in states.items()]
+    opstr = ';'.join(parts)
+    (success, reply) = self.operation(opstr)
+    if success is True:
+      # The device answers one status token per compound part; every token
+      # must be '1' for overall success.
+      tokens = reply.rpartition('=')[2].split(';')
+      success = (len(tokens) == len(parts) and
+                 all(token == '1' for token in tokens))
+    # Drop any cached reads of the switches just set.
+    for switch in states:
+      self._cache.pop(self.commandComposeScpi(None, switch), None)
+    self._log.info("SetMany {:} => {:s}".format(states, ['FAILED', 'OK'][success]))
+    return success
+
   def get(self, switch=None):
     """
     Get RF switch current state.
@@ -366,9 +507,18 @@ class rfswitch:
     :return: current state of the switch
     :rtype: int
     """
-    # Compose and send the operation.
+    # Compose and send the operation. Back-to-back polls of the same switch
+    # within the TTL are served from the cache instead of costing a bus
+    # round trip; set() invalidates the affected entry.
     cmd = self.commandComposeScpi(None, switch)
-    state = self.query(cmd)
+    now = time.monotonic()
+    hit = self._cache.get(cmd)
+    if hit is not None and now - hit[0] < self._cache_ttl:
+      state = hit[1]
+    else:
+      state = self.query(cmd)
+      if state is not None:
+        self._cache[cmd] = (now, state)
     # Extract data from reply.
     if state is None:
       self._log.error("Get Sw{:} => FAILED".format(switch))
@@ -377,6 +527,73 @@ class rfswitch:
       self._log.info("Get Sw{:}={:d}".format(switch, state))
     return state
 
+class rfswitchHttp(rfswitch):
+  """HTTP-transport variant of rfswitch for MiniCircuits RC-series switches.
+
+  RC switches accept the same SCPI commands over an HTTP GET interface.
+  A keep-alive session reuses one TCP connection across operations, which
+  avoids the Telnet session semantics (login/logout, idle disconnects)
+  and typically halves per-operation latency. Requires the requests
+  package (imported on open, so it stays an optional dependency).
+
+  The command/query/set/get surface is inherited from rfswitch.
+  """
+  __slots__ = ('_sess',)
+
+  def __init__(self, device, switch=None, loglevel=logging.ERROR):
+    super().__init__(device, switch=switch, loglevel=loglevel)
+    # Set in open(); initialized here so close() is safe to call anytime.
+    self._sess = None
+
+  def open(self):
+    """Open the HTTP session to the device."""
+    # Imported here so the HTTP transport stays optional.
+    import requests
+    from requests.adapters import HTTPAdapter
+    self._sess = requests.Session()
+    # One pooled keep-alive connection; every GET reuses the same socket.
+    self._sess.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    # Query and initialize the RF switch.
+    self.deviceInit()
+
+  def close(self):
+    """Close the HTTP session to the device."""
+    if self._sess is not None:
+      self._sess.close()
+      self._sess = None
+
+  def operation(self, operation):
+    """
+    Perform an operation on the device over HTTP.
+    :param str operation: the operation string
+    :return (success, reply) where
+      success bool: whether the command was successful
+      reply str: the reply string
+    :rtype: tuple
+    """
+    # Example:
+    #  GET http://192.168.1.100/:SP6TA:STATE:1 => '1'
+    self._log.debug("Sending operation: '%s'", operation)
+    try:
+      response = self._sess.get(
+        "http://{:s}/:{:s}".format(str(self._device), operation), timeout=2)
+    except OSError:
+      self._log.error("Connection to {:s} FAILED".format(str(self._device)))
+      return (False, "")
+    rxstring = response.text.strip()
+    # Verify that a reply arrived, otherwise the operation failed.
+    success = False
+    reply = None
+    if response.ok and rxstring != '':
+      # Some replies already include CMD=REPLY.
+      if '=' in rxstring:
+        reply = rxstring
+      else:
+        reply = operation.rstrip('?') + '=' + rxstring
+      success = True
+    self._log.debug("Received reply: '%s' => %s", reply, ['FAILED', 'OK'][success])
+    return (success, reply)
+
 def main():
   # Parse the arguments.
   parser = argparse.ArgumentParser(
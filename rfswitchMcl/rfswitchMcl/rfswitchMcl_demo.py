@@ -38,15 +38,12 @@ def rfswitchDirectCommandQuery(rfsw):
 
 def rfswitchBasicOperation(rfsw):
   # You can use letter or number arguments for switch.
-  rfsw.set(switch='A', state=1)
-  rfsw.set(switch='B', state=1)
-  rfsw.set(switch=0, state=1)
-  rfsw.set(switch=1, state=1)
+  # setMany updates all listed switches in one transmission.
+  rfsw.setMany({'A': 1, 'B': 1})
+  rfsw.setMany({0: 1, 1: 1})
   time.sleep(1)
-  rfsw.set(switch='A', state=0)
-  rfsw.set(switch='B', state=0)
-  rfsw.set(switch=0, state=0)
-  rfsw.set(switch=1, state=0)
+  rfsw.setMany({'A': 0, 'B': 0})
+  rfsw.setMany({0: 0, 1: 0})
   time.sleep(1)
   print(rfsw.get(switch='A'))
   print(rfsw.get(switch='B'))
@@ -55,11 +52,9 @@ def rfswitchBasicOperation(rfsw):
 
 def rfswitchRoundRobin(rfsw):
   for n in range(1,rfsw.states+1,1):
-    rfsw.set(switch='A', state=n)
-    rfsw.set(switch='B', state=n)
+    rfsw.setMany({'A': n, 'B': n})
     time.sleep(0.5)
-  rfsw.set(switch='A', state=0)
-  rfsw.set(switch='B', state=0)
+  rfsw.setMany({'A': 0, 'B': 0})
   print(rfsw.get(switch='A'))
   print(rfsw.get(switch='B'))
 
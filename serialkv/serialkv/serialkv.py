@@ -30,17 +30,80 @@ Example Usage:
 # system
 import argparse
 import logging
+import re
 import serial
 import sys
 import time
 
+# Key-value token pattern, compiled once at import.
+_KV = re.compile(r'(\S+?):(\S+)')
+
+# Optional Numba fast path for numeric-only frame scanning (see readValues).
+# Falls back to pure Python when Numba/NumPy are not installed.
+try:
+  import numpy as np
+  from numba import njit
+  _HAVE_NUMBA = True
+except ImportError:
+  _HAVE_NUMBA = False
+
+if _HAVE_NUMBA:
+  @njit(cache=True)
+  def _scanValues(buf):
+    """Scan 'key:value' tokens in raw frame bytes and return the values as
+    a float64 array in token order (non-numeric values become nan)."""
+    n = len(buf)
+    values = np.empty(n // 4 + 1, np.float64)
+    count = 0
+    i = 0
+    while i < n:
+      # Seek the ':' of the next token.
+      while i < n and buf[i] != 58:
+        i += 1
+      if i >= n:
+        break
+      i += 1
+      # Convert the value by digit accumulation.
+      sign = 1.0
+      if i < n and buf[i] == 45:
+        sign = -1.0
+        i += 1
+      value = 0.0
+      scale = 0.0
+      valid = False
+      while i < n and buf[i] > 32:
+        c = buf[i]
+        if 48 <= c <= 57:
+          value = value * 10.0 + (c - 48)
+          if scale > 0.0:
+            scale *= 10.0
+          valid = True
+        elif c == 46 and scale == 0.0:
+          scale = 1.0
+        else:
+          # Not numeric; skip the rest of this token.
+          valid = False
+          while i < n and buf[i] > 32:
+            i += 1
+          break
+        i += 1
+      if valid and scale > 0.0:
+        value /= scale
+      values[count] = sign * value if valid else np.nan
+      count += 1
+    return values[:count]
+
 class serialkv:
-  def __init__(self, serialport, baudrate=9600, timeout=2, line_terminator=b'\r', loglevel=logging.ERROR):
+  def __init__(self, serialport, baudrate=9600, timeout=2, line_terminator=b'\r', fast=False, loglevel=logging.ERROR):
     self._ser = serial.Serial()
     self._ser.port = serialport
     self._ser.baudrate = baudrate
     self._ser.timeout = timeout
     self._ser.line_terminator = line_terminator
+    # Receive buffer holding bytes read past the current frame terminator.
+    self._rxbuf = bytearray()
+    # Use the Numba-compiled scanner in readValues when available.
+    self._fast = fast and _HAVE_NUMBA
     logging.basicConfig(format = '%(levelname)s:%(name)s:%(message)s', level=loglevel)
     self._log = logging.getLogger(__name__)
 
@@ -54,18 +117,65 @@ class serialkv:
 
   def serialWrite(self, string):
     """Write string to serial device."""
-    self._log.debug("Serial Tx: \'{:s}\'".format(string))
+    self._log.debug("Serial Tx: '%s'", string)
     self._ser.write(string.encode())
     return
 
   def serialRead(self, maxchars):
     """Read string from serial device."""
-    #string = self._ser.read(maxchars).decode('utf-8')
-    string = self._ser.read_until(self._ser.line_terminator)
-    string = string.decode('utf-8')
-    self._log.debug("Serial Rx: \'{:s}\'".format(string))
+    string = self._readframe()
+    self._log.debug("Serial Rx: '%s'", string)
     return string
 
+  def _readframe(self):
+    """Read one terminator-delimited frame, decoded to str.
+    read_until polls the port byte-by-byte, a syscall per byte at frame
+    rate; reading in_waiting bytes at a time collects a buffered frame in
+    one or two syscalls instead. Bytes past the terminator stay buffered
+    for the next call."""
+    buf = self._rxbuf
+    term = self._ser.line_terminator
+    while True:
+      i = buf.find(term)
+      if i >= 0:
+        end = i + len(term)
+        frame = str(memoryview(buf)[:end], 'utf-8')
+        del buf[:end]
+        return frame
+      chunk = self._ser.read(max(1, self._ser.in_waiting))
+      if not chunk:
+        # Timed out without a terminator; return whatever arrived.
+        frame = buf.decode('utf-8')
+        buf.clear()
+        return frame
+      buf.extend(chunk)
+
+  async def openAsync(self):
+    """Open the communication port for asyncio use (alternative to open()).
+    Requires the pyserial-asyncio package."""
+    # Imported here so the asyncio path stays optional.
+    import serial_asyncio
+    (self._areader, self._awriter) = await serial_asyncio.open_serial_connection(
+      url=self._ser.port, baudrate=self._ser.baudrate)
+
+  async def closeAsync(self):
+    """Close the asyncio communication port."""
+    self._awriter.close()
+    self._areader = None
+    self._awriter = None
+
+  async def readAsync(self):
+    """
+    Asyncio variant of read(), so several serial devices can be polled
+    concurrently from one event loop (an M-device sweep then costs the
+    slowest device's latency instead of the sum of all of them). Open the
+    port with openAsync() first.
+    :return dict of keys-values, or None if unsuccessful
+    :rtype: dict
+    """
+    rxbytes = await self._areader.readuntil(self._ser.line_terminator)
+    return self.parse(rxbytes.decode('utf-8'))
+
   def read(self):
     """
     Read key-value string from the serial port and return dict.
@@ -77,30 +187,41 @@ class serialkv:
     kvdict = self.parse(rxstring)
     return kvdict
 
+  def readValues(self):
+    """
+    Read one frame and return just its numeric values, in token order.
+    For kHz-rate telemetry where the key set is fixed, this skips the
+    per-frame dict and key-string construction (pair one ordinary read()
+    with this to learn the keys once). With Numba installed and fast=True
+    the scan runs as native code and returns a float64 array; otherwise a
+    pure-Python fallback returns a list.
+    """
+    rxstring = self.serialRead(1024)
+    if self._fast:
+      return _scanValues(np.frombuffer(rxstring.encode('ascii'), dtype=np.uint8))
+    kvdict = self.parse(rxstring) or {}
+    return [v for v in kvdict.values() if not isinstance(v, str)]
+
   def parse(self, kvstring):
     # Example 'PD0:123 PD1:456 PD2:222 PD3:333'
     kvdict = {}
-    # Strip off any <CR><LF> or extra whitespace.
-    kvstring = str(kvstring).strip()
-    # Then split the space-separated fields.
-    kvstrarray = kvstring.split(' ')
-    # Try to convert each field to int, or float, or leave as string
-    for k in kvstrarray:
-      try:
-        (key,value) = k.split(':')
-      except ValueError:
-        return None
-      try:
+    # Match the key:value tokens directly; terminators, extra whitespace
+    # and malformed tokens simply fall outside the matches.
+    for (key, value) in _KV.findall(str(kvstring)):
+      # The isdigit fast paths avoid raising and catching a ValueError per
+      # numeric field, which dominates the cost on numeric-heavy frames.
+      # Strip at most one leading '-': lstrip would accept line noise like
+      # '--3' and then crash int() instead of keeping the token a string.
+      stripped = value[1:] if value.startswith('-') else value
+      if stripped.isdigit():
         kvdict[key] = int(value)
-      except ValueError:
-        try:
-          kvdict[key] = float(value)
-        except ValueError:
-          kvdict[key] = value
-          pass
+      elif stripped.replace('.', '', 1).isdigit():
+        kvdict[key] = float(value)
+      else:
+        kvdict[key] = value
     # Print parsed data.
-    self._log.debug("Parse {:}".format(kvdict))
-    return kvdict
+    self._log.debug("Parse %s", kvdict)
+    return kvdict or None
 
 def test():
   kvdict = skv.parse('PD0:123 PD1:456 PD2:222 PD3:333\r\n')